@@ -1,18 +1,86 @@
 import asyncio
+import json
 import os
+import time
 import streamlit as st
 import streamlit.components.v1 as components
 from datetime import date
 from agno.agent import Agent
 from agno.team.team import Team
 from agno.tools.mcp import MultiMCPTools
-from agno.models.openai import OpenAIChat
+from budgeted_model import BudgetedOpenAIChat
 # from agents import get_agents
 import nest_asyncio
 
 # Allow nested event loops (Streamlit-specific quirk)
 nest_asyncio.apply()
 
+# Per-agent model and budget settings.
+# max_tool_calls and max_run_tokens are budgets for a whole run: once either is
+# spent the agent may not call any more tools and has to give its final answer.
+# max_completion_tokens caps the length of every single completion.
+AGENT_CONFIG = {
+    "Maps Agent": {"model": "gpt-4o-mini", "max_tool_calls": 4, "max_run_tokens": 20000, "max_completion_tokens": 1024},
+    "Weather Agent": {"model": "gpt-4o-mini", "max_tool_calls": 6, "max_run_tokens": 30000, "max_completion_tokens": 1024},
+    "Booking Agent": {"model": "gpt-4o-mini", "max_tool_calls": 6, "max_run_tokens": 60000, "max_completion_tokens": 2048},
+    "Calendar Agent": {"model": "gpt-4o-mini", "max_tool_calls": 20, "max_run_tokens": 80000, "max_completion_tokens": 2048},
+    "Travel Planning Team": {"model": "gpt-4o-mini", "max_tool_calls": 12, "max_run_tokens": 100000, "max_completion_tokens": 4096},
+}
+
+# USD per 1M tokens (input, output), used for the run cost report
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+def build_model(name: str, api_key: str) -> BudgetedOpenAIChat:
+    config = AGENT_CONFIG[name]
+    return BudgetedOpenAIChat(
+        id=config["model"],
+        api_key=api_key,
+        max_tokens=config["max_completion_tokens"],
+        max_run_tokens=config["max_run_tokens"],
+        max_tool_calls=config["max_tool_calls"],
+    )
+
+
+def summarize_usage(name: str, response, model: BudgetedOpenAIChat, wall_time: float = None) -> dict:
+    """Collapse an agno run response into token, tool call, cost and latency totals."""
+    metrics = getattr(response, "metrics", None) or {}
+
+    def total(key):
+        value = metrics.get(key, 0)
+        return sum(v or 0 for v in value) if isinstance(value, list) else (value or 0)
+
+    config = AGENT_CONFIG[name]
+    input_price, output_price = MODEL_PRICING.get(config["model"], (0.0, 0.0))
+    input_tokens = total("input_tokens")
+    output_tokens = total("output_tokens")
+
+    return {
+        "agent": name,
+        "model": config["model"],
+        "tool_calls": len(getattr(response, "tools", None) or []),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": round((input_tokens * input_price + output_tokens * output_price) / 1_000_000, 6),
+        "latency_s": round(wall_time if wall_time is not None else total("time"), 2),
+        "stopped_by": model.stop_reason,
+    }
+
+
+def build_usage_report(team, result, wall_time: float) -> list:
+    """Per-agent usage rows for a team run, with the coordinator last."""
+    members_by_id = {member.agent_id: member for member in team.members}
+    rows = []
+    for member_response in getattr(result, "member_responses", None) or []:
+        member = members_by_id.get(getattr(member_response, "agent_id", None))
+        if member is not None and member.name in AGENT_CONFIG:
+            rows.append(summarize_usage(member.name, member_response, member.model))
+    rows.append(summarize_usage(team.name, result, team.model, wall_time))
+    return rows
+
 async def run_agent(message: str):
     # Get API keys from session state
     google_maps_key = st.session_state.get('google_maps_key')
@@ -57,8 +125,9 @@ async def run_agent(message: str):
                 
         maps_agent = Agent(
             tools=[mcp_tools],
-            model=OpenAIChat(id="gpt-4o-mini", api_key=openai_key),
+            model=build_model("Maps Agent", openai_key),
             name="Maps Agent",
+            tool_call_limit=AGENT_CONFIG["Maps Agent"]["max_tool_calls"],
             goal="""As a Maps Agent, your responsibilities include:
             1. Finding optimal routes between locations
             2. Identifying points of interest near destinations
@@ -79,8 +148,9 @@ async def run_agent(message: str):
 
         weather_agent = Agent( 
             tools=[mcp_tools],
-            model=OpenAIChat(id="gpt-4o-mini", api_key=openai_key),
+            model=build_model("Weather Agent", openai_key),
             name="Weather Agent",
+            tool_call_limit=AGENT_CONFIG["Weather Agent"]["max_tool_calls"],
             goal="""As a Weather Agent, your responsibilities include:
             1. Providing detailed weather forecasts for destinations
             2. Alerting about severe weather conditions
@@ -99,8 +169,9 @@ async def run_agent(message: str):
 
         booking_agent = Agent(
             tools=[mcp_tools],
-            model=OpenAIChat(id="gpt-4o-mini", api_key=openai_key),
+            model=build_model("Booking Agent", openai_key),
             name="Booking Agent",
+            tool_call_limit=AGENT_CONFIG["Booking Agent"]["max_tool_calls"],
             goal="""As a Booking Agent, your responsibilities include:
             1. Finding accommodations within budget on airbnb
             2. Comparing prices across platforms
@@ -119,8 +190,9 @@ async def run_agent(message: str):
 
         calendar_agent = Agent(
             tools=[mcp_tools],
-            model=OpenAIChat(id="gpt-4o-mini", api_key=openai_key),
+            model=build_model("Calendar Agent", openai_key),
             name="Calendar Agent",
+            tool_call_limit=AGENT_CONFIG["Calendar Agent"]["max_tool_calls"],
             goal="""As a Calendar Agent, your responsibilities include:
             1. Creating detailed travel itineraries
             2. Setting reminders for bookings and check-ins
@@ -145,6 +217,8 @@ async def run_agent(message: str):
         team = Team(
             members=[ maps_agent, weather_agent, booking_agent, calendar_agent], 
             name="Travel Planning Team",
+            model=build_model("Travel Planning Team", openai_key),
+            tool_call_limit=AGENT_CONFIG["Travel Planning Team"]["max_tool_calls"],
             markdown=True,
             show_tool_calls=True,
             instructions="""As a Travel Planning Team, coordinate to create comprehensive travel plans:
@@ -181,7 +255,9 @@ async def run_agent(message: str):
         # )
 
         # --------------------------------------------------------------------
+        started = time.perf_counter()
         result = await team.arun(message)
+        usage_report = build_usage_report(team, result, time.perf_counter() - started)
 
         # Collect final markdown response
         final_output = result.messages[-1].content
@@ -212,7 +288,7 @@ async def run_agent(message: str):
                         st.markdown(f"- 🔗 [View in Google Calendar]({tool_data.get('calendar_link', 'https://calendar.google.com/calendar/u/0/r?tab=mc')})")
 
         # Add the agent final markdown response
-        return final_output
+        return final_output, usage_report
 
     
     
@@ -368,11 +444,20 @@ if st.button("Plan My Trip", type="primary", disabled=not all_keys_filled):
 
                 
                 # Run the agents
-                response = asyncio.run(run_agent(message))
+                response, usage_report = asyncio.run(run_agent(message))
                 
                 # Display the response
                 st.success("✅ Your travel plan is ready!")
                 st.markdown(response)
+
+                # Cost and latency breakdown per agent
+                with st.expander("📊 Run usage by agent"):
+                    st.dataframe(usage_report, use_container_width=True)
+                    total_cost = sum(row["cost_usd"] for row in usage_report)
+                    st.markdown(f"**Total cost:** ${total_cost:.4f}")
+                    stopped = {row["agent"]: row["stopped_by"] for row in usage_report if row["stopped_by"]}
+                    for agent_name, stopped_by in stopped.items():
+                        st.warning(f"{agent_name} was stopped early by its {stopped_by}.")
                 
             except Exception as e:
                 st.error(f"An error occurred while planning your trip: {str(e)}")
@@ -0,0 +1,111 @@
+# bench_logging.py
+#
+# Per-call logging overhead of an MCP tool call, before and after mcp_logging.
+# "before" mirrors the old setup: DEBUG level, synchronous stderr handler and
+# the full API response formatted with an f-string on every call. The "after"
+# rows add one piece of mcp_logging at a time at DEBUG (JSON encoding without a
+# size cap, the early-stopping size cap, sampling, then the queue handler), so
+# each is measured against that path.
+# INFO rows show the default level. Queue rows time only the calling thread.
+# Output goes to os.devnull so only the logging cost is measured.
+#
+#   python bench_logging.py [calls]
+
+import os
+import sys
+import json
+import time
+import queue
+import logging
+from logging.handlers import QueueListener
+
+import mcp_logging
+from mcp_logging import JsonFormatter, StructuredQueueHandler, log_payload
+
+# Shaped like a Directions API response with a few dozen steps
+PAYLOAD = {
+    "status": "OK",
+    "routes": [{
+        "summary": "I-5 N",
+        "legs": [{
+            "distance": {"text": "280 mi", "value": 450000},
+            "duration": {"text": "4 hours 30 mins", "value": 16200},
+            "steps": [
+                {
+                    "html_instructions": f"Continue onto <b>Route {i}</b>",
+                    "distance": {"text": f"{i}.2 mi", "value": i * 1600},
+                    "polyline": {"points": "a~l~Fjk~uOwHJy@P" * 20},
+                }
+                for i in range(60)
+            ],
+        }],
+    }],
+}
+
+
+def make_logger(name, handler, level):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def before(logger, data):
+    logger.debug("Getting route summary from Portland to Seattle")
+    logger.debug(f"Directions API response: {data}")
+    logger.debug(f"Returning route summary: {data['routes'][0]['summary']}")
+
+
+def after(logger, data):
+    logger.debug("Getting route summary from %s to %s", "Portland", "Seattle")
+    log_payload(logger, "Directions API response", data)
+    logger.info("Route %s -> %s: %s", "Portland", "Seattle", data["routes"][0]["summary"])
+
+
+def bench(label, fn, logger, calls, sample_rate=1.0, max_body=mcp_logging.LOG_MAX_BODY):
+    mcp_logging.LOG_SAMPLE_RATE = sample_rate
+    mcp_logging.LOG_MAX_BODY = max_body
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn(logger, PAYLOAD)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<52} {elapsed / calls * 1e6:10.1f} us/call")
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sampled = mcp_logging.LOG_SAMPLE_RATE
+    max_body = mcp_logging.LOG_MAX_BODY
+    sink = open(os.devnull, "w")
+    print(f"payload: {len(json.dumps(PAYLOAD))} chars, {calls} calls, max body {max_body}")
+
+    sync_handler = logging.StreamHandler(sink)
+    sync_handler.setFormatter(logging.Formatter("DEBUG: %(asctime)s - %(message)s"))
+    sync_logger = make_logger("bench.sync", sync_handler, logging.DEBUG)
+    bench("before (DEBUG, sync, full payload)", before, sync_logger, calls)
+    bench("after (DEBUG, sync, sample 1.0, uncapped)", after, sync_logger, calls, max_body=sys.maxsize)
+    bench(f"after (DEBUG, sync, sample 1.0, capped at {max_body})", after, sync_logger, calls)
+    bench(f"after (DEBUG, sync, sampled {sampled:g})", after, sync_logger, calls, sampled)
+
+    for fmt_name, formatter in [("text", logging.Formatter("%(levelname)s: %(asctime)s - %(name)s - %(message)s")),
+                                ("json", JsonFormatter())]:
+        out = logging.StreamHandler(sink)
+        out.setFormatter(formatter)
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, out)
+        listener.start()
+        handler = StructuredQueueHandler(log_queue)
+
+        debug_logger = make_logger(f"bench.{fmt_name}.debug", handler, logging.DEBUG)
+        bench(f"after {fmt_name} (DEBUG, queue, sample 1.0)", after, debug_logger, calls)
+        bench(f"after {fmt_name} (DEBUG, queue, sampled {sampled:g})", after, debug_logger, calls, sampled)
+        bench(f"after {fmt_name} (INFO, queue)", after,
+              make_logger(f"bench.{fmt_name}.info", handler, logging.INFO), calls, sampled)
+        listener.stop()
+
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# budgeted_model.py
+#
+# OpenAIChat with a per-run tool call and token budget, used for every agent
+# and the team coordinator in app.py.
+
+from dataclasses import dataclass
+from typing import Optional
+from agno.models.openai import OpenAIChat
+
+
+@dataclass
+class BudgetedOpenAIChat(OpenAIChat):
+    """OpenAIChat that enforces a per-run tool call and token budget.
+
+    Usage and requested tool calls are added up after every completion, and
+    over_budget names the first budget that was exceeded. Requests made after
+    that are sent with tool_choice="none", which ends the agent's tool loop.
+    stop_reason is only set when such a request is actually sent, so an agent
+    whose last completion crossed the budget is not reported as stopped early.
+    """
+
+    max_run_tokens: Optional[int] = None
+    max_tool_calls: Optional[int] = None
+    tokens_used: int = 0
+    tool_calls_requested: int = 0
+    over_budget: Optional[str] = None
+    stop_reason: Optional[str] = None
+
+    def _apply_budget(self, kwargs: dict):
+        if not self.over_budget:
+            return
+        self.stop_reason = self.over_budget
+        if "tool_choice" in kwargs:
+            kwargs["tool_choice"] = "none"
+        else:
+            self.tool_choice = "none"
+
+    def _record_usage(self, response):
+        usage = getattr(response, "usage", None)
+        if usage:
+            self.tokens_used += (usage.prompt_tokens or 0) + (usage.completion_tokens or 0)
+        choices = getattr(response, "choices", None) or []
+        if choices:
+            self.tool_calls_requested += len(choices[0].message.tool_calls or [])
+
+        if self.over_budget:
+            return
+        if self.max_run_tokens and self.tokens_used >= self.max_run_tokens:
+            self.over_budget = f"token budget ({self.max_run_tokens})"
+        elif self.max_tool_calls and self.tool_calls_requested > self.max_tool_calls:
+            # More calls were requested than the budget allows, so some were cut off
+            self.over_budget = f"tool call budget ({self.max_tool_calls})"
+
+    def invoke(self, *args, **kwargs):
+        self._apply_budget(kwargs)
+        response = super().invoke(*args, **kwargs)
+        self._record_usage(response)
+        return response
+
+    async def ainvoke(self, *args, **kwargs):
+        self._apply_budget(kwargs)
+        response = await super().ainvoke(*args, **kwargs)
+        self._record_usage(response)
+        return response
@@ -1,21 +1,23 @@
 #!/usr/bin/env python
 import os
+import asyncio
+import hashlib
 import json
-import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httplib2
 from dotenv import load_dotenv
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from mcp.server.fastmcp import FastMCP
+from mcp_logging import configure_logging, log_payload
 
 load_dotenv()
 
-logging.basicConfig(
-  level=logging.DEBUG,
-  format='DEBUG: %(asctime)s - %(message)s',
-  stream=sys.stderr
-)
-logger = logging.getLogger(__name__)
+logger = configure_logging("calendar_mcp")
 
 mcp = FastMCP("Google Calendar MCP", dependencies=["python-dotenv", "google-api-python-client", "google-auth", "google-auth-oauthlib"])
 
@@ -27,7 +29,67 @@ if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET or not GOOGLE_REFRESH_TOKEN:
   logger.error("Error: GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, and GOOGLE_REFRESH_TOKEN environment variables are required")
   raise ValueError("Missing required environment variables for Google Calendar API")
 
-print("✅ GOOGLE_CLIENT_ID:", os.getenv("GOOGLE_CLIENT_ID"))
+logger.info("Google Calendar credentials loaded")
+
+# googleapiclient is blocking, so Calendar calls run on a bounded thread pool
+# instead of the MCP event loop. The pool size caps concurrent inserts.
+CALENDAR_MAX_WORKERS = int(os.getenv("CALENDAR_MAX_WORKERS", "4"))
+CALENDAR_TIMEOUT_SECONDS = float(os.getenv("CALENDAR_TIMEOUT_SECONDS", "30"))
+
+calendar_executor = ThreadPoolExecutor(max_workers=CALENDAR_MAX_WORKERS, thread_name_prefix="calendar")
+
+# Google OAuth2, built once and reused across inserts
+creds = Credentials(
+  None, 
+  refresh_token=GOOGLE_REFRESH_TOKEN,
+  token_uri="https://oauth2.googleapis.com/token",
+  client_id=GOOGLE_CLIENT_ID,
+  client_secret=GOOGLE_CLIENT_SECRET,
+  scopes=["https://www.googleapis.com/auth/calendar"]
+)
+
+calendar_local = threading.local()
+
+def get_calendar_service():
+  """Calendar service for the current worker thread.
+
+  httplib2 connections are not thread-safe, so each worker builds one service
+  and reuses it, instead of re-parsing the discovery document on every insert.
+  The socket timeout bounds a stalled request even after the awaiting
+  coroutine has been cancelled.
+  """
+  service = getattr(calendar_local, 'service', None)
+  if service is None:
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=CALENDAR_TIMEOUT_SECONDS))
+    service = calendar_local.service = build('calendar', 'v3', http=http, cache_discovery=False)
+  return service
+
+def event_id(event: dict) -> str:
+  """Deterministic event id, so a retried insert of the same event gets a 409 instead of a duplicate.
+
+  The whole request body is hashed, so an event with the same title and times
+  but a different location, attendees, description or reminders gets its own id.
+  """
+  body = json.dumps(event, sort_keys=True, separators=(',', ':'))
+  # Calendar ids allow base32hex characters (0-9, a-v), which covers a hex digest
+  return hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+def insert_event(event: dict) -> dict:
+  """Blocking insert, run on calendar_executor."""
+  events = get_calendar_service().events()
+  try:
+    return events.insert(calendarId='primary', body=event).execute()
+  except HttpError as error:
+    if error.resp.status != 409:
+      raise
+  # The id is taken and ids cover the full body, so an identical earlier attempt
+  # (e.g. one that timed out) already went through
+  logger.info('Event %s already exists, reusing it', event['id'])
+  existing = events.get(calendarId='primary', eventId=event['id']).execute()
+  if existing.get('status') == 'cancelled':
+    # Deleted events keep their id, so restore it instead
+    return events.update(calendarId='primary', eventId=event['id'], body={**event, 'status': 'confirmed'}).execute()
+  return existing
 
 @mcp.tool()
 async def create_event(
@@ -53,27 +115,9 @@ async def create_event(
   Returns:
       String with event creation confirmation and link
   """
-  logger.debug(f'Creating calendar event with args: {locals()}')
+  logger.debug('Creating calendar event %r from %s to %s', summary, start_time, end_time)
   
   try:
-    logger.debug('Creating OAuth2 client')
-    # Google OAuth2 
-    creds = Credentials(
-      None, 
-      refresh_token=GOOGLE_REFRESH_TOKEN,
-      token_uri="https://oauth2.googleapis.com/token",
-      client_id=GOOGLE_CLIENT_ID,
-      client_secret=GOOGLE_CLIENT_SECRET,
-      scopes=["https://www.googleapis.com/auth/calendar"]
-    )
-    logger.debug('OAuth2 client created')
-
-    print("SCOPES:", creds.scopes)
-    
-    logger.debug('Creating calendar service')
-    calendar_service = build('calendar', 'v3', credentials=creds)
-    logger.debug('Calendar service created')
-    
     event = {
       'summary': summary,
       'start': {
@@ -91,15 +135,12 @@ async def create_event(
     
     if location:
       event['location'] = location
-      logger.debug(f'Location added: {location}')
     
     if attendees:
       event['attendees'] = [{'email': email} for email in attendees]
-      logger.debug(f'Attendees added: {event["attendees"]}')
     
     if reminders:
       event['reminders'] = reminders
-      logger.debug(f'Custom reminders set: {json.dumps(reminders)}')
     else:
       event['reminders'] = {
         'useDefault': False,
@@ -107,12 +148,16 @@ async def create_event(
           {'method': 'popup', 'minutes': 10}
         ]
       }
-      logger.debug(f'Default reminders set: {json.dumps(event["reminders"])}')
     
-    logger.debug('Attempting to insert event')
-    response = calendar_service.events().insert(calendarId='primary', body=event).execute()
-    logger.debug('Event inserted successfully')
-    logger.debug(f'Event insert response: {json.dumps(response)}')
+    event['id'] = event_id(event)
+    log_payload(logger, 'Event insert request', event)
+    loop = asyncio.get_running_loop()
+    response = await asyncio.wait_for(
+      loop.run_in_executor(calendar_executor, insert_event, event),
+      timeout=CALENDAR_TIMEOUT_SECONDS
+    )
+    logger.info('Event inserted: %r', summary)
+    log_payload(logger, 'Event insert response', response)
     
     return {
     "status": "success",
@@ -123,12 +168,16 @@ async def create_event(
     }
 
     
+  except asyncio.TimeoutError:
+    logger.error('Event insert timed out after %ss: %r', CALENDAR_TIMEOUT_SECONDS, summary)
+    raise Exception(
+      f"Failed to create event: Calendar API did not respond within {CALENDAR_TIMEOUT_SECONDS}s. "
+      "The event may still have been created; retrying with the same details will not duplicate it."
+    )
+
   except Exception as error:
-    logger.debug(f'ERROR OCCURRED:')
-    logger.debug(f'Error type: {type(error).__name__}')
-    logger.debug(f'Error message: {str(error)}')
-    import traceback
-    logger.debug(f'Error traceback: {traceback.format_exc()}')
+    logger.error('Failed to create event %r: %s: %s', summary, type(error).__name__, error,
+                 exc_info=logger.isEnabledFor(logging.DEBUG))
     raise Exception(f"Failed to create event: {str(error)}")
 
 def main():
@@ -138,8 +187,10 @@ def main():
   except KeyboardInterrupt:
     logger.info("Server stopped by user")
   except Exception as e:
-    logger.error(f"Fatal error running server: {e}")
+    logger.error("Fatal error running server: %s", e)
     raise
+  finally:
+    calendar_executor.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == "__main__":
   main()
\ No newline at end of file
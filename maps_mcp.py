@@ -1,24 +1,45 @@
 import os 
+import re
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 from aiohttp import ClientSession
-import logging
-import sys
+import place_cache
+from mcp_logging import configure_logging, log_payload
 
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="DEBUG: %(asctime)s - %(message)s",
-    stream=sys.stderr
-)
-logger = logging.getLogger(__name__)
+logger = configure_logging("maps_mcp")
 
 
 mcp = FastMCP("Google Maps MCP", dependencies=["python-dotenv", "aiohttp"])
 
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
+def has_coordinates(place) -> bool:
+    return bool(place) and "lat" in place and "lng" in place
+
+
+def to_waypoint(query: str, place) -> str:
+    """Directions waypoint for a location: cached "lat,lng" if known, otherwise the free text."""
+    if has_coordinates(place):
+        return f"{place['lat']},{place['lng']}"
+    return query
+
+
+def remember_endpoint(query: str, address: str, location: dict):
+    """Store the geocoded start/end of a Directions leg, e.g. "Portland, OR 97201, USA"."""
+    # Drop postal codes so "OR 97201" qualifies the place as "OR"
+    parts = [re.sub(r"\s*\d[\w-]*", "", part).strip() for part in address.split(",")]
+    place_cache.remember(
+        query,
+        name=parts[0],
+        country=parts[-1] if len(parts) > 1 else None,
+        lat=location["lat"],
+        lng=location["lng"],
+        regions=parts[1:-1]
+    )
+
+
 @mcp.tool()
 async def get_route_summary(origin: str, destination: str) -> dict:
 
@@ -31,15 +52,20 @@ async def get_route_summary(origin: str, destination: str) -> dict:
         dict with route summary and Google Maps link
     """
 
-    logger.debug(f"Getting route summary from {origin} to {destination}")
+    logger.debug("Getting route summary from %s to %s", origin, destination)
 
     if not GOOGLE_MAPS_API_KEY:
         raise ValueError("GOOGLE_MAPS_API_KEY environment variable is not set")
     
+    # Places resolved by an earlier call (here or in weather_mcp) are sent as
+    # coordinates, so Google does not have to geocode the free text again
+    origin_place = place_cache.lookup(origin)
+    destination_place = place_cache.lookup(destination)
+
     base_url = "https://maps.googleapis.com/maps/api/directions/json"
     params = {
-        "origin": origin,
-        "destination": destination,
+        "origin": to_waypoint(origin, origin_place),
+        "destination": to_waypoint(destination, destination_place),
         "key": GOOGLE_MAPS_API_KEY
     }
 
@@ -48,12 +74,12 @@ async def get_route_summary(origin: str, destination: str) -> dict:
             
             data = await response.json()
 
-    logger.debug(f"Directions API response: {data}")
+    log_payload(logger, "Directions API response", data)
 
     if data["status"] != "OK":
         error_message = data.get("error_message", "No error message provided")
         if data["status"] == "NOT_FOUND":
-            logger.warning(f"No route found between {origin} and {destination}")
+            logger.warning("No route found between %s and %s", origin, destination)
             return {
                 "route_summary": "No route found between the specified locations.",
                 "map_link": f"https://www.google.com/maps/dir/{origin.replace(' ', '+')}/{destination.replace(' ', '+')}",
@@ -62,10 +88,15 @@ async def get_route_summary(origin: str, destination: str) -> dict:
         raise Exception(f"Google Maps API error: {data['status']} – {error_message}")
     
     leg = data["routes"][0]["legs"][0]
+    if not has_coordinates(origin_place):
+        remember_endpoint(origin, leg["start_address"], leg["start_location"])
+    if not has_coordinates(destination_place):
+        remember_endpoint(destination, leg["end_address"], leg["end_location"])
+
     summary = f"{leg['distance']['text']} in approximately {leg['duration']['text']}"
     link = f"https://www.google.com/maps/dir/{origin.replace(' ', '+')}/{destination.replace(' ', '+')}"
 
-    logger.debug(f"Returning route summary: {summary}, link: {link}")
+    logger.info("Route %s -> %s: %s", origin, destination, summary)
 
     return {
         "route_summary": summary,
@@ -74,7 +105,6 @@ async def get_route_summary(origin: str, destination: str) -> dict:
                  f'src="https://www.google.com/maps/embed/v1/directions?key={GOOGLE_MAPS_API_KEY}&origin={origin}&destination={destination}" '
                  f'allowfullscreen></iframe>' 
     }
-    print("✅ Sent maps tool response:", {"route_summary": summary, "map_link": link})
 
 
 def main():
@@ -84,7 +114,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("MCP server stopped by user")
     except Exception as e:
-        logger.error(f"Error running MCP server: {e}")
+        logger.error("Error running MCP server: %s", e)
         raise
 
 if __name__ == "__main__":
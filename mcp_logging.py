@@ -0,0 +1,133 @@
+# mcp_logging.py
+#
+# Logging setup shared by the MCP servers. Records are handed to a queue and
+# written to stderr by a background thread, so a tool call never waits on log
+# I/O. Message formatting (including payload serialization) still happens on
+# the calling thread, because a payload may be mutated once the call returns.
+# Sampling and the size cap, which stops serialization early, keep that cheap.
+# stdout is left alone because the stdio MCP transport uses it.
+#
+# Environment:
+#   MCP_LOG_LEVEL        DEBUG, INFO, WARNING, ... (default INFO)
+#   MCP_LOG_FORMAT       "text" or "json" (default text)
+#   MCP_LOG_SAMPLE_RATE  fraction of API payloads logged at DEBUG (default 0.1)
+#   MCP_LOG_MAX_BODY     max characters of a logged payload (default 2000)
+#
+# Invalid values fall back to the defaults and are reported as a warning once
+# logging is configured.
+
+import os
+import sys
+import copy
+import json
+import atexit
+import queue
+import random
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+_config_warnings = []
+
+
+def _env_setting(name: str, default, parse, valid):
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = parse(raw)
+    except ValueError:
+        value = None
+    if value is None or not valid(value):
+        _config_warnings.append(f"Ignoring invalid {name}={raw!r}, using {default!r}")
+        return default
+    return value
+
+
+LOG_LEVEL = _env_setting("MCP_LOG_LEVEL", "INFO", str.upper, lambda level: isinstance(logging.getLevelName(level), int))
+LOG_FORMAT = _env_setting("MCP_LOG_FORMAT", "text", str.lower, lambda fmt: fmt in ("text", "json"))
+LOG_SAMPLE_RATE = _env_setting("MCP_LOG_SAMPLE_RATE", 0.1, float, lambda rate: 0 <= rate <= 1)
+LOG_MAX_BODY = _env_setting("MCP_LOG_MAX_BODY", 2000, int, lambda size: size > 0)
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback out of the message.
+
+    The stock prepare() appends the traceback to msg and clears exc_info, so the
+    listener's formatter could not tell them apart. Here the traceback is
+    rendered into exc_text instead, which both formatters emit on their own.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def truncated_json(data, limit: int) -> str:
+    """JSON for data, cut off after `limit` characters.
+
+    JSONEncoder.iterencode() yields the document in chunks, so encoding stops
+    once the limit is reached instead of serializing the whole body first.
+    """
+    chunks, size = [], 0
+    try:
+        for chunk in json.JSONEncoder(default=str).iterencode(data):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                return "".join(chunks)[:limit] + "... (truncated)"
+    except (TypeError, ValueError):
+        return repr(data)[:limit]
+    return "".join(chunks)
+
+
+def configure_logging(name: str) -> logging.Logger:
+    """Install the queue-based stderr handler on the root logger and return `name`'s logger."""
+    global _listener
+    if _listener is None:
+        handler = logging.StreamHandler(sys.stderr)
+        if LOG_FORMAT == "json":
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter("%(levelname)s: %(asctime)s - %(name)s - %(message)s"))
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        root = logging.getLogger()
+        root.handlers = [StructuredQueueHandler(log_queue)]
+        root.setLevel(LOG_LEVEL)
+        for warning in _config_warnings:
+            root.warning(warning)
+
+    return logging.getLogger(name)
+
+
+def log_payload(logger: logging.Logger, message: str, data) -> None:
+    """Log an API payload at DEBUG for a sampled fraction of calls, capped at LOG_MAX_BODY chars."""
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= LOG_SAMPLE_RATE:
+        return
+    logger.debug("%s: %s", message, truncated_json(data, LOG_MAX_BODY))
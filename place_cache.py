@@ -0,0 +1,207 @@
+# place_cache.py
+#
+# Place resolution shared by maps_mcp and weather_mcp. Both servers resolve the
+# same free-text city names, so resolved places are stored once together with
+# their coordinates, region and country names and provider keys (e.g. the
+# AccuWeather location key).
+#
+# A query is split into a city name and optional qualifiers: "Portland, ME" is
+# "portland" qualified by "me". A qualified query only matches a place known to
+# carry all of its qualifiers, so it never resolves to another city that shares
+# the name. There is deliberately no fuzzy matching: "Lyons" or "Parris" are
+# real places too, so a near miss is a cache miss and is resolved upstream.
+# Spelling variants hit the cache only through BUILTIN_ALIASES or once a
+# provider has resolved that exact query to a cached place.
+
+import os
+import re
+import json
+import math
+import logging
+import tempfile
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CACHE_DIR = Path.home() / ".cache" / "travel_planner"
+PLACE_CACHE_FILE = CACHE_DIR / "places.json"
+
+logger = logging.getLogger(__name__)
+
+# Results with the same city name closer than this are the same place. Results
+# with different names are only merged when the caller passes same_as.
+SAME_PLACE_KM = 25
+
+# Common short forms that no provider would match on their own
+BUILTIN_ALIASES = {
+    "nyc": "new york",
+    "new york city": "new york",
+    "la": "los angeles",
+    "sf": "san francisco",
+    "dc": "washington",
+    "washington dc": "washington",
+    "philly": "philadelphia",
+    "vegas": "las vegas",
+}
+
+_places: Dict[str, Dict] = {}
+_aliases: Dict[str, str] = {}
+_loaded_mtime: Optional[float] = None
+
+
+def normalize(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace. Commas are kept."""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    name = re.sub(r"[^\w\s,]", " ", name.lower())
+    name = re.sub(r"\s*,\s*", ", ", name)
+    return re.sub(r"\s+", " ", name).strip(" ,")
+
+
+def parse(query: str) -> Tuple[str, List[str]]:
+    """Split a query into its city name and qualifiers ("new york, ny" -> ("new york", ["ny"]))."""
+    key = normalize(query)
+    key = BUILTIN_ALIASES.get(key, key)
+    head, *qualifiers = key.split(", ")
+    return BUILTIN_ALIASES.get(head, head), qualifiers
+
+
+def _normalize_all(values: Iterable[Optional[str]]) -> List[str]:
+    return [normalize(value) for value in values if value and normalize(value)]
+
+
+def _distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+
+def _load():
+    """(Re)load the cache file if another server process has written it since."""
+    global _places, _aliases, _loaded_mtime
+    try:
+        mtime = PLACE_CACHE_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return
+    if mtime == _loaded_mtime:
+        return
+    try:
+        with open(PLACE_CACHE_FILE, "r") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return
+    # Entries without a "head" come from the older, unqualified format and are dropped
+    _places = {place_id: place for place_id, place in data.get("places", {}).items() if "head" in place}
+    _aliases = {alias: place_id for alias, place_id in data.get("aliases", {}).items() if place_id in _places}
+    for place_id, place in _places.items():
+        place.setdefault("id", place_id)
+    _loaded_mtime = mtime
+
+
+def _save():
+    global _loaded_mtime
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Write to a temp file and swap it in, so the other server never reads a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"places": _places, "aliases": _aliases}, f, indent=2)
+    os.replace(tmp_path, PLACE_CACHE_FILE)
+    _loaded_mtime = PLACE_CACHE_FILE.stat().st_mtime
+
+
+def _matching(head: str, qualifiers: List[str]) -> List[Dict]:
+    return [
+        place for place in _places.values()
+        if place["head"] == head and set(qualifiers) <= set(place["qualifiers"])
+    ]
+
+
+def lookup(query: str) -> Optional[Dict]:
+    """Return the cached place for a free-text query, or None if it has not been resolved yet.
+
+    None is also returned for an ambiguous query, e.g. "portland" when both
+    Portland, OR and Portland, ME are cached, so the caller asks upstream.
+    """
+    _load()
+    place_id = _aliases.get(normalize(query))
+    if place_id:
+        return _places[place_id]
+
+    matches = _matching(*parse(query))
+    return matches[0] if len(matches) == 1 else None
+
+
+def _is_same_place(place: Dict, lat: Optional[float], lng: Optional[float], regions: List[str], countries: List[str]) -> bool:
+    if lat is not None and lng is not None and "lat" in place:
+        return _distance_km(lat, lng, place["lat"], place["lng"]) < SAME_PLACE_KM
+    # Without coordinates, a shared country proves nothing (Springfield, IL and
+    # Springfield, MO are both in the US), so a region has to be shared as well
+    known_countries = set(place.get("countries", []))
+    if known_countries and countries and not known_countries & set(countries):
+        return False
+    return bool(set(place.get("regions", [])) & set(regions))
+
+
+def remember(
+    query: str,
+    name: str,
+    country: Optional[str] = None,
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    regions: Iterable[Optional[str]] = (),
+    countries: Iterable[Optional[str]] = (),
+    same_as: Optional[Dict] = None,
+    **provider_keys: str
+) -> Dict:
+    """Store or update a resolved place and index the query as an alias for it.
+
+    Args:
+        query: The free-text name the caller asked for (e.g. "NYC")
+        name: The provider's name for the place (e.g. "New York")
+        country: Country name, if known
+        lat, lng: Coordinates, if known
+        regions: Region names or codes for the place (e.g. ["NY", "New York"])
+        countries: Other names or codes for the country (e.g. ["US"])
+        same_as: A cached place this result was resolved from (e.g. by its
+            coordinates), merged into even if the provider names it differently
+        provider_keys: Provider specific ids, e.g. accuweather_key="349727"
+    Returns:
+        The stored place entry
+    """
+    _load()
+    head, name_qualifiers = parse(name)
+    regions = _normalize_all(regions) + name_qualifiers
+    countries = _normalize_all([*countries, country])
+    # The provider resolved the query to this place, so the query's qualifiers describe it too
+    qualifiers = regions + countries + parse(query)[1]
+
+    # same_as may come from before a reload, so it is matched by id rather than identity
+    place_id = same_as.get("id") if same_as else None
+    if place_id not in _places:
+        place_id = next(
+            (place_id for place_id, place in _places.items()
+             if place["head"] == head and _is_same_place(place, lat, lng, regions, countries)),
+            None
+        )
+    if place_id is None:
+        place_id = head
+        suffix = 2
+        while place_id in _places:
+            place_id = f"{head} #{suffix}"
+            suffix += 1
+        _places[place_id] = {"id": place_id, "name": name, "head": head, "qualifiers": []}
+
+    place = _places[place_id]
+    for key, values in (("qualifiers", qualifiers), ("regions", regions), ("countries", countries)):
+        place[key] = list(dict.fromkeys(place.get(key, []) + values))
+    if country:
+        place["country"] = country
+    if lat is not None and lng is not None:
+        place["lat"], place["lng"] = lat, lng
+    place.update({k: v for k, v in provider_keys.items() if v})
+    _aliases[normalize(query)] = place_id
+
+    try:
+        _save()
+    except OSError as e:
+        logger.warning("Failed to save place cache: %s", e)
+    return place
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The servers are top-level scripts, so make the repo root importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
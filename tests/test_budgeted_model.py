@@ -0,0 +1,108 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+openai_models = pytest.importorskip("agno.models.openai")
+
+from budgeted_model import BudgetedOpenAIChat
+
+
+def completion(tool_calls=0, prompt_tokens=100, completion_tokens=10):
+    message = SimpleNamespace(tool_calls=[object()] * tool_calls or None)
+    return SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+        choices=[SimpleNamespace(message=message)],
+    )
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Queue of fake completions; records the tool_choice each request was sent with."""
+    queued, sent = [], []
+
+    def invoke(self, messages, tool_choice=None, **kwargs):
+        sent.append(tool_choice)
+        return queued.pop(0)
+
+    async def ainvoke(self, messages, tool_choice=None, **kwargs):
+        return invoke(self, messages, tool_choice=tool_choice)
+
+    monkeypatch.setattr(openai_models.OpenAIChat, "invoke", invoke)
+    monkeypatch.setattr(openai_models.OpenAIChat, "ainvoke", ainvoke)
+    return SimpleNamespace(queued=queued, sent=sent)
+
+
+def make_model(**budget):
+    return BudgetedOpenAIChat(id="gpt-4o-mini", api_key="test", **budget)
+
+
+def test_within_budget(responses):
+    model = make_model(max_run_tokens=1000, max_tool_calls=3)
+    responses.queued += [completion(tool_calls=2), completion()]
+
+    model.invoke([], tool_choice="auto")
+    model.invoke([], tool_choice="auto")
+
+    assert responses.sent == ["auto", "auto"]
+    assert model.tokens_used == 220
+    assert model.over_budget is None
+    assert model.stop_reason is None
+
+
+def test_crossing_budget_on_final_completion_is_not_a_stop(responses):
+    model = make_model(max_run_tokens=200)
+    responses.queued += [completion(tool_calls=1), completion()]
+
+    model.invoke([], tool_choice="auto")
+    model.invoke([], tool_choice="auto")
+
+    assert model.over_budget == "token budget (200)"
+    assert model.stop_reason is None
+
+
+def test_token_budget_forces_final_answer(responses):
+    model = make_model(max_run_tokens=200)
+    responses.queued += [completion(tool_calls=1), completion(tool_calls=1), completion()]
+
+    for _ in range(3):
+        model.invoke([], tool_choice="auto")
+
+    assert responses.sent == ["auto", "auto", "none"]
+    assert model.stop_reason == "token budget (200)"
+
+
+def test_tool_call_budget_forces_final_answer(responses):
+    model = make_model(max_tool_calls=3)
+    responses.queued += [completion(tool_calls=2), completion(tool_calls=2), completion()]
+
+    for _ in range(3):
+        model.invoke([], tool_choice="auto")
+
+    assert responses.sent == ["auto", "auto", "none"]
+    assert model.stop_reason == "tool call budget (3)"
+
+
+def test_exactly_using_the_tool_call_budget_is_not_over_budget(responses):
+    model = make_model(max_tool_calls=4)
+    responses.queued += [completion(tool_calls=2), completion(tool_calls=2), completion()]
+
+    for _ in range(3):
+        model.invoke([], tool_choice="auto")
+
+    assert model.over_budget is None
+    assert model.stop_reason is None
+
+
+def test_async_path_is_budgeted(responses):
+    model = make_model(max_run_tokens=100)
+    responses.queued += [completion(tool_calls=1), completion()]
+
+    async def run():
+        await model.ainvoke([], tool_choice="auto")
+        await model.ainvoke([], tool_choice="auto")
+
+    asyncio.run(run())
+
+    assert responses.sent == ["auto", "none"]
+    assert model.stop_reason == "token budget (100)"
@@ -0,0 +1,72 @@
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+import pytest
+
+import mcp_logging
+from mcp_logging import JsonFormatter, StructuredQueueHandler, truncated_json
+
+
+def log_error_through_queue(formatter):
+    out = io.StringIO()
+    handler = logging.StreamHandler(out)
+    handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+
+    logger = logging.getLogger(f"test_mcp_logging.{type(formatter).__name__}")
+    logger.handlers = [StructuredQueueHandler(log_queue)]
+    logger.propagate = False
+    try:
+        raise ZeroDivisionError("boom")
+    except ZeroDivisionError:
+        logger.error("Insert failed for %s", "Dinner", exc_info=True)
+    listener.stop()
+    return out.getvalue()
+
+
+def test_json_formatter_keeps_traceback_out_of_msg():
+    entry = json.loads(log_error_through_queue(JsonFormatter()))
+
+    assert entry["msg"] == "Insert failed for Dinner"
+    assert entry["exc"].count("Traceback (most recent call last)") == 1
+    assert "ZeroDivisionError: boom" in entry["exc"]
+
+
+def test_text_formatter_prints_traceback_once():
+    output = log_error_through_queue(logging.Formatter("%(levelname)s: %(message)s"))
+
+    assert output.startswith("ERROR: Insert failed for Dinner\n")
+    assert output.count("Traceback (most recent call last)") == 1
+    assert output.count("ZeroDivisionError: boom") == 1
+
+
+def test_truncated_json_stops_at_the_limit():
+    data = {"steps": [{"text": f"step {i}"} for i in range(1000)]}
+
+    assert truncated_json({"a": 1}, 100) == '{"a": 1}'
+    assert truncated_json(data, 50) == json.dumps(data)[:50] + "... (truncated)"
+
+
+@pytest.mark.parametrize("name, raw, default, parse, valid", [
+    ("MCP_LOG_SAMPLE_RATE", "often", 0.1, float, lambda rate: 0 <= rate <= 1),
+    ("MCP_LOG_SAMPLE_RATE", "2", 0.1, float, lambda rate: 0 <= rate <= 1),
+    ("MCP_LOG_MAX_BODY", "2k", 2000, int, lambda size: size > 0),
+    ("MCP_LOG_LEVEL", "LOUD", "INFO", str.upper, lambda level: isinstance(logging.getLevelName(level), int)),
+])
+def test_invalid_settings_fall_back_with_a_warning(monkeypatch, name, raw, default, parse, valid):
+    monkeypatch.setenv(name, raw)
+    monkeypatch.setattr(mcp_logging, "_config_warnings", [])
+
+    assert mcp_logging._env_setting(name, default, parse, valid) == default
+    assert mcp_logging._config_warnings == [f"Ignoring invalid {name}={raw!r}, using {default!r}"]
+
+
+def test_valid_setting_is_used(monkeypatch):
+    monkeypatch.setenv("MCP_LOG_MAX_BODY", "500")
+
+    assert mcp_logging._env_setting("MCP_LOG_MAX_BODY", 2000, int, lambda size: size > 0) == 500
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+import place_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(place_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(place_cache, "PLACE_CACHE_FILE", tmp_path / "places.json")
+    monkeypatch.setattr(place_cache, "_places", {})
+    monkeypatch.setattr(place_cache, "_aliases", {})
+    monkeypatch.setattr(place_cache, "_loaded_mtime", None)
+    return tmp_path / "places.json"
+
+
+def remember_portland_or():
+    return place_cache.remember("Portland, OR", "Portland", "USA", 45.52, -122.68, regions=["OR"])
+
+
+def test_parse_splits_qualifiers_and_expands_aliases():
+    assert place_cache.parse("New York, NY") == ("new york", ["ny"])
+    assert place_cache.parse("NYC") == ("new york", [])
+    assert place_cache.parse("São Paulo ,  Brazil") == ("sao paulo", ["brazil"])
+
+
+def test_normalized_variants_hit_the_same_place():
+    place = place_cache.remember("NYC", "New York", "United States", 40.71, -74.01,
+                                 regions=["NY"], countries=["US"], accuweather_key="349727")
+
+    for query in ["New York", "new york, ny", "New-York", "NEW YORK CITY", "New York, United States"]:
+        assert place_cache.lookup(query) is place
+
+
+@pytest.mark.parametrize("cached, near_miss", [
+    (("Lyon", "Lyon", "France", 45.76, 4.84), "Lyons"),
+    (("Paris", "Paris", "France", 48.86, 2.35), "Parris"),
+    (("Portland, OR", "Portland", "USA", 45.52, -122.68), "Portlnd"),
+])
+def test_near_miss_names_are_not_answered_from_the_cache(cached, near_miss):
+    place_cache.remember(*cached, accuweather_key="1")
+
+    assert place_cache.lookup(near_miss) is None
+
+
+def test_misspelling_hits_once_resolved_upstream():
+    portland_or = remember_portland_or()
+    # Directions geocoded the typo to the same coordinates
+    place_cache.remember("Portlnd", "Portland", "USA", 45.52, -122.68, regions=["OR"])
+
+    assert place_cache.lookup("Portlnd") is portland_or
+
+
+def test_qualifier_must_match():
+    remember_portland_or()
+
+    assert place_cache.lookup("Portland, OR") is not None
+    assert place_cache.lookup("Portland, ME") is None
+
+
+def test_other_country_with_same_name_misses():
+    place_cache.remember("Paris", "Paris", "France", 48.86, 2.35, regions=["Ile-de-France"], countries=["FR"],
+                         accuweather_key="623")
+
+    assert place_cache.lookup("Paris, France")["accuweather_key"] == "623"
+    assert place_cache.lookup("Paris, TX") is None
+
+
+def test_qualified_query_only_matches_its_own_country():
+    place_cache.remember("San Jose", "San Jose", "USA", 37.34, -121.89, regions=["CA"])
+
+    assert place_cache.lookup("san jose, costa rica") is None
+    assert place_cache.lookup("san jose, costa rica, central america") is None
+
+
+def test_same_name_places_are_kept_apart_and_bare_name_is_ambiguous():
+    portland_or = remember_portland_or()
+    portland_me = place_cache.remember("Portland, ME", "Portland", "USA", 43.66, -70.26, regions=["ME"])
+
+    assert portland_or is not portland_me
+    assert place_cache.lookup("Portland, OR") is portland_or
+    assert place_cache.lookup("Portland, ME") is portland_me
+    assert place_cache.lookup("Portland, USA") is None
+    assert place_cache.lookup("Portland") is None
+
+
+def test_places_without_coordinates_sharing_only_a_country_stay_apart():
+    illinois = place_cache.remember("Springfield, IL", "Springfield", "United States", regions=["IL"], countries=["US"])
+    missouri = place_cache.remember("Springfield, MO", "Springfield", "US", regions=["MO"])
+
+    assert illinois is not missouri
+    assert place_cache.lookup("Springfield, IL") is illinois
+    assert place_cache.lookup("Springfield, MO") is missouri
+
+
+def test_places_without_coordinates_merge_on_a_shared_region():
+    first = place_cache.remember("Springfield, IL", "Springfield", "United States", regions=["IL"])
+    second = place_cache.remember("Springfield, Illinois", "Springfield", "United States", regions=["IL", "Illinois"])
+
+    assert second is first
+
+
+def test_resolved_query_is_remembered_as_alias():
+    portland_or = remember_portland_or()
+    place_cache.remember("Portland, ME", "Portland", "USA", 43.66, -70.26, regions=["ME"])
+    place_cache.remember("Portland", "Portland", "USA", 45.52, -122.68, regions=["OR"])
+
+    assert place_cache.lookup("portland") is portland_or
+
+
+def test_short_form_and_long_form_share_one_entry():
+    place_cache.remember("New York City", "New York City", "USA", 40.71, -74.01)
+    place_cache.remember("NYC", "New York", "USA", 40.71, -74.01)
+
+    assert list(place_cache._places) == ["new york"]
+    assert set(place_cache._aliases.values()) == {"new york"}
+
+
+def test_providers_merge_by_coordinates():
+    maps_place = place_cache.remember("Seattle", "Seattle", "USA", 47.6062, -122.3321, regions=["WA"])
+    weather_place = place_cache.remember("Seattle, Washington", "Seattle", "United States", 47.603, -122.33,
+                                         regions=["WA", "Washington"], countries=["US"], accuweather_key="351409")
+
+    assert weather_place is maps_place
+    assert maps_place["accuweather_key"] == "351409"
+    assert place_cache.lookup("Seattle, US")["lat"] == 47.603
+
+
+def test_same_as_merges_a_differently_named_result():
+    maps_place = place_cache.remember("Manhattan", "Manhattan", "USA", 40.78, -73.97, regions=["NY"])
+
+    # weather_mcp ran a geoposition search on the cached coordinates
+    weather_place = place_cache.remember("Manhattan", "New York", "United States", 40.71, -74.01,
+                                         regions=["NY"], countries=["US"], same_as=maps_place,
+                                         accuweather_key="349727")
+
+    assert weather_place is maps_place
+    assert len(place_cache._places) == 1
+    assert place_cache.lookup("Manhattan")["accuweather_key"] == "349727"
+
+
+def test_same_as_survives_a_reload():
+    maps_place = place_cache.remember("Manhattan", "Manhattan", "USA", 40.78, -73.97, regions=["NY"])
+    place_cache._loaded_mtime = None
+    place_cache._load()
+
+    place_cache.remember("Manhattan", "New York", "United States", 40.71, -74.01, same_as=maps_place,
+                         accuweather_key="349727")
+
+    assert list(place_cache._places) == ["manhattan"]
+
+
+def test_cache_is_shared_through_the_file(cache_file):
+    remember_portland_or()
+
+    # Simulate the other server process starting with an empty cache
+    place_cache._places, place_cache._aliases, place_cache._loaded_mtime = {}, {}, None
+    assert place_cache.lookup("Portland, OR")["lat"] == 45.52
+
+
+def test_old_unqualified_entries_are_ignored(cache_file):
+    cache_file.write_text(json.dumps({
+        "places": {"portland": {"name": "Portland", "accuweather_key": "350473"}},
+        "aliases": {"portland, me": "portland"},
+    }))
+
+    assert place_cache.lookup("Portland, ME") is None
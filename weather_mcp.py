@@ -1,68 +1,59 @@
 # weather_mcp.py
 
 import os
-import json
-from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 from aiohttp import ClientSession
+import place_cache
+from mcp_logging import configure_logging, log_payload
 
 load_dotenv()
+logger = configure_logging("weather_mcp")
 mcp = FastMCP("mcp-weather")
 
-CACHE_DIR = Path.home() / ".cache" / "weather"
-LOCATION_CACHE_FILE = CACHE_DIR / "location_cache.json"
-
-def get_cached_location_key(location: str) -> Optional[str]:
-    if not LOCATION_CACHE_FILE.exists():
-        return None
-    try:
-        with open(LOCATION_CACHE_FILE, "r") as f:
-            cache = json.load(f)
-            return cache.get(location)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return None
-
-def cache_location_key(location: str, location_key: str):
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    try:
-        if LOCATION_CACHE_FILE.exists():
-            with open(LOCATION_CACHE_FILE, "r") as f:
-                cache = json.load(f)
-        else:
-            cache = {}
-        cache[location] = location_key
-        with open(LOCATION_CACHE_FILE, "w") as f:
-            json.dump(cache, f, indent=2)
-    except Exception as e:
-        print(f"Warning: Failed to cache location key: {e}")
-
 @mcp.tool()
 async def get_hourly_weather(location: str) -> Dict:
     api_key = os.getenv("ACCUWEATHER_API_KEY")
     base_url = "http://dataservice.accuweather.com"
-    location_key = get_cached_location_key(location)
-
-    locations = None
+    place = place_cache.lookup(location)
+    location_key = place.get("accuweather_key") if place else None
 
     async with ClientSession() as session:
         if not location_key:
-            location_search_url = f"{base_url}/locations/v1/cities/search"
-            params = { "apikey": api_key, "q": location }
+            # Coordinates from an earlier maps lookup pin the exact city, otherwise search by name
+            if place and "lat" in place and "lng" in place:
+                location_search_url = f"{base_url}/locations/v1/cities/geoposition/search"
+                params = { "apikey": api_key, "q": f"{place['lat']},{place['lng']}" }
+            else:
+                location_search_url = f"{base_url}/locations/v1/cities/search"
+                params = { "apikey": api_key, "q": location }
             async with session.get(location_search_url, params=params) as response:
                 locations = await response.json()
                 if response.status != 200:
                     raise Exception(f"Error fetching location data: {response.status}, {locations}")
                 if not locations:
                     raise Exception("Location not found")
-            location_key = locations[0]["Key"]
-            cache_location_key(location, location_key)
-        else:
-            locations = [{
-                "localizedName": location,
-                "Country": {"LocalizedName": "Unknown" }
-            }]
+            # geoposition search returns a single location rather than a list
+            found = locations[0] if isinstance(locations, list) else locations
+            geo = found.get("GeoPosition", {})
+            place = place_cache.remember(
+                location,
+                name=found["LocalizedName"],
+                country=found["Country"]["LocalizedName"],
+                lat=geo.get("Latitude"),
+                lng=geo.get("Longitude"),
+                regions=[
+                    found.get("AdministrativeArea", {}).get("ID"),
+                    found.get("AdministrativeArea", {}).get("LocalizedName")
+                ],
+                countries=[found["Country"].get("ID")],
+                # A geoposition result refines the place its coordinates came from,
+                # even if AccuWeather names it differently
+                same_as=place,
+                accuweather_key=found["Key"]
+            )
+            location_key = found["Key"]
 
         current_conditions_url = f"{base_url}/currentconditions/v1/{location_key}"
         params = { "apikey": api_key }
@@ -104,14 +95,15 @@ async def get_hourly_weather(location: str) -> Dict:
             }
 
         result = {
-            "location": locations[0]["LocalizedName"],
+            "location": place.get("name", location),
             "location_key": location_key,
-            "country": locations[0]["Country"]["LocalizedName"],
+            "country": place.get("country", "Unknown"),
             "current_conditions": current_data,
             "hourly_forecast": hourly_data
         }
 
-        print("✅ Sent weather tool response:", json.dumps(result, indent=2))
+        logger.info("Weather for %s (%s): %s", result["location"], location_key, current_data.get("weather_text"))
+        log_payload(logger, "Weather tool response", result)
         return result
 
 